@@ -69,6 +69,17 @@ At this point your charm will be automatically instrumented so that:
     - every event as a span (including custom events)
     - every charm method call (except dunders) as a span
 
+Properties and classmethods are not instrumented. If you wish to exclude some (typically, cheap
+and frequently called) methods from instrumentation, decorate them with ``@no_trace``:
+
+```
+from charms.tempo_k8s.v1.charm_tracing import no_trace
+
+    @no_trace
+    def _is_ready(self) -> bool:
+        return self._ready
+```
+
 
 ## TLS support
 If your charm integrates with a TLS provider which is also trusted by the tracing provider (the Tempo charm),
@@ -170,6 +181,31 @@ needs to be replaced with:
 
 3) If you were passing a certificate (str) using `server_cert`, you need to change it to
 provide an *absolute* path to the certificate file instead.
+
+## Tuning the span processor
+By default, spans are buffered by a ``BatchSpanProcessor`` and flushed when the charm's framework closes.
+Set ``CHARM_TRACING_SPAN_PROCESSOR=simple`` to export each span as soon as it ends instead; for
+hooks that only emit a handful of spans, this can be cheaper than running the batch processor.
+The batch processor is configured for short-lived hooks; you can tweak it by setting any of these
+environment variables (positive integers) in the charm's environment:
+
+- ``CHARM_TRACING_MAX_QUEUE_SIZE`` (default: 512)
+- ``CHARM_TRACING_SCHEDULE_DELAY_MILLIS`` (default: 500)
+- ``CHARM_TRACING_MAX_EXPORT_BATCH_SIZE`` (default: 128)
+- ``CHARM_TRACING_EXPORT_TIMEOUT_MILLIS`` (default: 3000)
+
+Similarly, ``CHARM_TRACING_FLUSH_TIMEOUT_MILLIS`` (default: 500) bounds how long the charm will wait
+for the remaining spans to be sent before exiting.
+
+To skip charm tracing altogether for some high-frequency, low-interest events, set
+``CHARM_TRACING_SKIP_EVENTS`` to a comma-separated list of event names, for example
+``CHARM_TRACING_SKIP_EVENTS=update-status,collect-metrics``.
+
+Before setting up the exporter, the charm checks that it can open a tcp connection to the tracing
+endpoint, waiting at most ``CHARM_TRACING_PROBE_TIMEOUT_MILLIS`` (default: 1000) for name
+resolution and connection together. If it can't, charm tracing is disabled for that hook.
+The check is skipped if the exporter would reach the endpoint through a proxy (as configured by
+``HTTP_PROXY``, ``HTTPS_PROXY`` and ``NO_PROXY``).
 """
 
 
@@ -225,35 +261,41 @@ def _remove_stale_otel_sdk_packages():
 _remove_stale_otel_sdk_packages()
 
 import functools
-import inspect
 import logging
 import os
+import socket
+import sys
+import threading
+import time
+import types
+import weakref
 from contextlib import contextmanager
-from contextvars import Context, ContextVar, copy_context
-from pathlib import Path
+from contextvars import ContextVar, Token
 from typing import (
-    Any,
+    TYPE_CHECKING,
     Callable,
-    Generator,
+    Dict,
+    Iterator,
+    List,
     Optional,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
-    cast,
 )
+from urllib.parse import ParseResult, urlparse
 
-import opentelemetry
 import ops
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import Span, TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.context import attach, detach
 from opentelemetry.trace import (
     INVALID_SPAN,
+    # charms may import Span from here (it used to come from the sdk, which subclasses this one)
+    Span,
+    Status,
+    StatusCode,
     Tracer,
     get_tracer,
-    get_tracer_provider,
     set_span_in_context,
     set_tracer_provider,
 )
@@ -261,6 +303,11 @@ from opentelemetry.trace import get_current_span as otlp_get_current_span
 from ops.charm import CharmBase
 from ops.framework import Framework
 
+if TYPE_CHECKING:
+    # the sdk is only imported at runtime if charm tracing is active
+    from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+
 # The unique Charmhub library identifier, never change it
 LIBID = "cb1705dcd1a14ca09b2e60187d1215c7"
 
@@ -270,7 +317,7 @@ LIBAPI = 1
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
 
-LIBPATCH = 15
+LIBPATCH = 16
 
 PYDEPS = ["opentelemetry-exporter-otlp-proto-http==1.21.0"]
 
@@ -284,17 +331,189 @@ _CharmType = Type[CharmBase]  # the type CharmBase and any subclass thereof
 _C = TypeVar("_C", bound=_CharmType)
 _T = TypeVar("_T", bound=type)
 _F = TypeVar("_F", bound=Type[Callable])
+# the tracer of the charm being executed, if charm tracing is active.
+# A plain module global: hooks are single-threaded, one-shot processes, and this is read on every
+# traced call, so we want the cheapest possible lookup.
+_ACTIVE_TRACER: Optional[Tracer] = None
+# kept for backwards compatibility with charms that use it to create their own spans: it's set
+# to the active tracer for as long as there is one. Use `_ACTIVE_TRACER` internally.
 tracer: ContextVar[Tracer] = ContextVar("tracer")
+_tracer_token: Optional[Token] = None
 _GetterType = Union[Callable[[_CharmType], Optional[str]], property]
 
 CHARM_TRACING_ENABLED = "CHARM_TRACING_ENABLED"
 
+# Comma-separated names of the juju events (e.g. "update-status,collect-metrics") for which
+# charm tracing should not be set up at all.
+CHARM_TRACING_SKIP_EVENTS = "CHARM_TRACING_SKIP_EVENTS"
+
+# Which span processor to use: "batch" (default) or "simple".
+# A SimpleSpanProcessor exports each span synchronously as it ends: no background thread, no
+# queue, and nothing left to flush on exit, which can be cheaper for hooks that only emit a
+# handful of spans.
+CHARM_TRACING_SPAN_PROCESSOR = "CHARM_TRACING_SPAN_PROCESSOR"
+# BatchSpanProcessor tuning knobs.
+# Charm hooks are short-lived and the processor is flushed synchronously on framework.close,
+# so the sdk defaults (2048 queue, 512 batch, 5s schedule delay, 30s export timeout) would let
+# a slow or unreachable tracing backend stall the hook for tens of seconds.
+CHARM_TRACING_MAX_QUEUE_SIZE = "CHARM_TRACING_MAX_QUEUE_SIZE"
+CHARM_TRACING_SCHEDULE_DELAY_MILLIS = "CHARM_TRACING_SCHEDULE_DELAY_MILLIS"
+CHARM_TRACING_MAX_EXPORT_BATCH_SIZE = "CHARM_TRACING_MAX_EXPORT_BATCH_SIZE"
+CHARM_TRACING_EXPORT_TIMEOUT_MILLIS = "CHARM_TRACING_EXPORT_TIMEOUT_MILLIS"
+_BSP_DEFAULTS = {
+    CHARM_TRACING_MAX_QUEUE_SIZE: 512,
+    CHARM_TRACING_SCHEDULE_DELAY_MILLIS: 500,
+    CHARM_TRACING_MAX_EXPORT_BATCH_SIZE: 128,
+    CHARM_TRACING_EXPORT_TIMEOUT_MILLIS: 3000,
+}
+# Wall-clock budget for the final flush on framework.close.
+CHARM_TRACING_FLUSH_TIMEOUT_MILLIS = "CHARM_TRACING_FLUSH_TIMEOUT_MILLIS"
+_FLUSH_TIMEOUT_MILLIS_DEFAULT = 500
+# Timeout for the tcp preflight check against the tracing endpoint.
+CHARM_TRACING_PROBE_TIMEOUT_MILLIS = "CHARM_TRACING_PROBE_TIMEOUT_MILLIS"
+# generous enough for cross-model relations and slow name resolution.
+_PROBE_TIMEOUT_MILLIS_DEFAULT = 1000
+# endpoint -> (probe time, reachable), so that charms instantiated repeatedly in the same
+# process (e.g. in tests) don't each pay for the probe.
+_PROBE_CACHE: Dict[str, Tuple[float, bool]] = {}
+_PROBE_CACHE_TTL = 30  # seconds
+
 
 def is_enabled() -> bool:
     """Whether charm tracing is enabled."""
+    # not cached: this is only checked when decorating and once per charm init, never per traced
+    # call, and a process-wide cache would go stale if the env changes in between (e.g. in tests).
     return os.getenv(CHARM_TRACING_ENABLED, "1") == "1"
 
 
+def _get_env_int(envvar: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to ``default``."""
+    value = os.getenv(envvar)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        parsed = 0
+    if parsed <= 0:
+        logger.warning(f"invalid value {value!r} for {envvar}; defaulting to {default}.")
+        return default
+    return parsed
+
+
+def _get_batch_span_processor_config() -> dict:
+    """BatchSpanProcessor arguments, tuned for short-lived charm hooks and overridable via env."""
+    max_queue_size = _get_env_int(
+        CHARM_TRACING_MAX_QUEUE_SIZE, _BSP_DEFAULTS[CHARM_TRACING_MAX_QUEUE_SIZE]
+    )
+    max_export_batch_size = _get_env_int(
+        CHARM_TRACING_MAX_EXPORT_BATCH_SIZE,
+        _BSP_DEFAULTS[CHARM_TRACING_MAX_EXPORT_BATCH_SIZE],
+    )
+    if max_export_batch_size > max_queue_size:
+        # BatchSpanProcessor refuses batches larger than its queue.
+        logger.warning(
+            f"{CHARM_TRACING_MAX_EXPORT_BATCH_SIZE} ({max_export_batch_size}) is larger than "
+            f"{CHARM_TRACING_MAX_QUEUE_SIZE} ({max_queue_size}); "
+            f"clamping it to {max_queue_size}."
+        )
+        max_export_batch_size = max_queue_size
+    return {
+        "max_queue_size": max_queue_size,
+        "schedule_delay_millis": _get_env_int(
+            CHARM_TRACING_SCHEDULE_DELAY_MILLIS,
+            _BSP_DEFAULTS[CHARM_TRACING_SCHEDULE_DELAY_MILLIS],
+        ),
+        "max_export_batch_size": max_export_batch_size,
+        "export_timeout_millis": _get_env_int(
+            CHARM_TRACING_EXPORT_TIMEOUT_MILLIS,
+            _BSP_DEFAULTS[CHARM_TRACING_EXPORT_TIMEOUT_MILLIS],
+        ),
+    }
+
+
+def _is_skipped_event(event_name: str) -> bool:
+    """Whether the user asked not to trace this event, via ``CHARM_TRACING_SKIP_EVENTS``."""
+    skip_events = os.getenv(CHARM_TRACING_SKIP_EVENTS)
+    if not skip_events:
+        return False
+    return event_name in {name.strip() for name in skip_events.split(",")}
+
+
+def _get_span_processor(exporter: "SpanExporter") -> "SpanProcessor":
+    """Build the span processor selected via ``CHARM_TRACING_SPAN_PROCESSOR``."""
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+
+    processor_type = os.getenv(CHARM_TRACING_SPAN_PROCESSOR, "batch")
+    if processor_type == "simple":
+        return SimpleSpanProcessor(exporter)
+    if processor_type != "batch":
+        logger.warning(
+            f"invalid value {processor_type!r} for {CHARM_TRACING_SPAN_PROCESSOR}; "
+            f"defaulting to 'batch'."
+        )
+    return BatchSpanProcessor(exporter, **_get_batch_span_processor_config())
+
+
+def _can_connect(host: str, port: int, timeout: float) -> bool:
+    """Whether we can open a tcp connection to host:port within ``timeout`` seconds.
+
+    The socket timeout doesn't cover name resolution, which can hang for a long time if the
+    endpoint is gone (or DNS is broken), so we run the whole thing in a daemon thread and stop
+    waiting for it once the timeout expires.
+    """
+    result = []
+
+    def _connect():
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                result.append(True)
+        except OSError:
+            result.append(False)
+
+    thread = threading.Thread(target=_connect, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return bool(result and result[0])
+
+
+def _is_proxied(url: ParseResult) -> bool:
+    """Whether the exporter would go through a proxy (``HTTPS_PROXY``, ``NO_PROXY``...) for url."""
+    # same env lookup as requests, which the exporter uses
+    from urllib.request import getproxies, proxy_bypass
+
+    return bool(getproxies().get(url.scheme)) and not proxy_bypass(url.netloc)
+
+
+def _probe_endpoint(endpoint: str) -> bool:
+    """Check whether the tracing endpoint accepts tcp connections.
+
+    If we can't find out what host and port to probe, or if the exporter would reach it through a
+    proxy, we assume the endpoint is reachable and let the exporter figure it out.
+    """
+    url = urlparse(endpoint)
+    host = url.hostname
+    if not host:
+        return True
+    try:
+        port = url.port or {"http": 80, "https": 443}.get(url.scheme)
+    except ValueError:
+        return True
+    if not port or _is_proxied(url):
+        return True
+
+    cached = _PROBE_CACHE.get(endpoint)
+    if cached and 0 <= time.time() - cached[0] < _PROBE_CACHE_TTL:
+        return cached[1]
+
+    timeout = (
+        _get_env_int(CHARM_TRACING_PROBE_TIMEOUT_MILLIS, _PROBE_TIMEOUT_MILLIS_DEFAULT) / 1000
+    )
+    reachable = _can_connect(host, port, timeout)
+    _PROBE_CACHE[endpoint] = (time.time(), reachable)
+    return reachable
+
+
 @contextmanager
 def charm_tracing_disabled():
     """Contextmanager to temporarily disable charm tracing.
@@ -303,8 +522,10 @@ def charm_tracing_disabled():
     """
     previous = os.getenv(CHARM_TRACING_ENABLED, "1")
     os.environ[CHARM_TRACING_ENABLED] = "0"
-    yield
-    os.environ[CHARM_TRACING_ENABLED] = previous
+    try:
+        yield
+    finally:
+        os.environ[CHARM_TRACING_ENABLED] = previous
 
 
 def get_current_span() -> Union[Span, None]:
@@ -316,52 +537,53 @@ def get_current_span() -> Union[Span, None]:
     span = otlp_get_current_span()
     if span is INVALID_SPAN:
         return None
-    return cast(Span, span)
+    return span
 
 
-def _get_tracer_from_context(ctx: Context) -> Optional[ContextVar]:
-    tracers = [v for v in ctx if v is not None and v.name == "tracer"]
-    if tracers:
-        return tracers[0]
-    return None
-
-
-def _get_tracer() -> Optional[Tracer]:
-    """Find tracer in context variable and as a fallback locate it in the full context."""
-    try:
-        return tracer.get()
-    except LookupError:
-        # fallback: this course-corrects for a user error where charm_tracing symbols are imported
-        # from different paths (typically charms.tempo_k8s... and lib.charms.tempo_k8s...)
-        try:
-            ctx: Context = copy_context()
-            if context_tracer := _get_tracer_from_context(ctx):
-                logger.warning(
-                    "Tracer not found in `tracer` context var. "
-                    "Verify that you're importing all `charm_tracing` symbols from the same module path. \n"
-                    "For example, DO"
-                    ": `from charms.lib...charm_tracing import foo, bar`. \n"
-                    "DONT: \n"
-                    " \t - `from charms.lib...charm_tracing import foo` \n"
-                    " \t - `from lib...charm_tracing import bar` \n"
-                    "For more info: https://python-notes.curiousefficiency.org/en/latest/python"
-                    "_concepts/import_traps.html#the-double-import-trap"
-                )
-                return context_tracer.get()
-            else:
-                return None
-        except LookupError:
-            return None
-
+def _get_duplicate_modules() -> List[types.ModuleType]:
+    """Return any other copy of this module imported from a different path.
 
-@contextmanager
-def _span(name: str) -> Generator[Optional[Span], Any, Any]:
-    """Context to create a span if there is a tracer, otherwise do nothing."""
-    if tracer := _get_tracer():
-        with tracer.start_as_current_span(name) as span:
-            yield cast(Span, span)
-    else:
-        yield None
+    This happens when charm_tracing symbols are imported from different paths (typically
+    charms.tempo_k8s... and lib.charms.tempo_k8s...).
+    See https://python-notes.curiousefficiency.org/en/latest/python_concepts/import_traps.html#the-double-import-trap
+    """
+    this = sys.modules.get(__name__)
+    return [
+        module
+        for name, module in list(sys.modules.items())
+        if name.endswith("charm_tracing")
+        and module is not this
+        and getattr(module, "LIBID", None) == LIBID
+        and hasattr(module, "_ACTIVE_TRACER")
+    ]
+
+
+def _set_active_tracer(tracer_: Optional[Tracer]):
+    """Set (or unset) the active tracer on this module and any duplicate copy of it."""
+    global _ACTIVE_TRACER, _tracer_token
+    _ACTIVE_TRACER = tracer_
+    if tracer_ is not None:
+        _tracer_token = tracer.set(tracer_)
+    elif _tracer_token is not None:
+        tracer.reset(_tracer_token)
+        _tracer_token = None
+
+    # this course-corrects for a user error where charm_tracing symbols are imported
+    # from different paths, so that functions traced via the other copy aren't silently lost.
+    for module in _get_duplicate_modules():
+        if tracer_ is not None:
+            logger.warning(
+                f"charm_tracing is imported from multiple paths ({__name__}, {module.__name__}). "
+                "Verify that you're importing all `charm_tracing` symbols from the same module path. \n"
+                "For example, DO"
+                ": `from charms.lib...charm_tracing import foo, bar`. \n"
+                "DONT: \n"
+                " \t - `from charms.lib...charm_tracing import foo` \n"
+                " \t - `from lib...charm_tracing import bar` \n"
+                "For more info: https://python-notes.curiousefficiency.org/en/latest/python"
+                "_concepts/import_traps.html#the-double-import-trap"
+            )
+        module._ACTIVE_TRACER = tracer_  # type: ignore
 
 
 class TracingError(RuntimeError):
@@ -396,15 +618,16 @@ def _get_tracing_endpoint(
             f"got {tracing_endpoint} instead."
         )
 
-    dev_logger.debug(f"Setting up span exporter to endpoint: {tracing_endpoint}/v1/traces")
-    return f"{tracing_endpoint}/v1/traces"
+    endpoint = tracing_endpoint + "/v1/traces"
+    dev_logger.debug("Setting up span exporter to endpoint: %s", endpoint)
+    return endpoint
 
 
 def _get_server_cert(
     server_cert_attr: str,
     charm_instance: ops.CharmBase,
     charm_type: Type[ops.CharmBase],
-):
+) -> Optional[str]:
     _server_cert = getattr(charm_instance, server_cert_attr)
     if callable(_server_cert):
         server_cert = _server_cert()
@@ -416,12 +639,76 @@ def _get_server_cert(
             f"{charm_type}.{server_cert_attr} is None; sending traces over INSECURE connection."
         )
         return
-    elif not Path(server_cert).is_absolute():
+    elif not os.path.isabs(server_cert):
         raise ValueError(
             f"{charm_type}.{server_cert_attr} should resolve to a valid tls cert absolute path (string | Path)); "
             f"got {server_cert} instead."
         )
-    return server_cert
+    return os.fspath(server_cert)
+
+
+def _flush_and_shutdown(tp: "TracerProvider"):
+    """Flush the remaining spans, within a bounded time budget, and shut down the provider."""
+    # don't block for too long: if tempo is slow or unreachable, we'd rather drop spans
+    # than amplify the hook duration.
+    try:
+        flushed = tp.force_flush(
+            timeout_millis=_get_env_int(
+                CHARM_TRACING_FLUSH_TIMEOUT_MILLIS, _FLUSH_TIMEOUT_MILLIS_DEFAULT
+            )
+        )
+    except Exception:
+        logger.exception("failed flushing charm traces")
+    else:
+        if not flushed:
+            logger.warning("timed out flushing charm traces; some spans may be lost.")
+
+    # shut down regardless, or the span processor's worker thread is left running.
+    # closing the exporter session may block on the socket; keep it off the critical path.
+    threading.Thread(target=tp.shutdown, daemon=True).start()
+
+
+def _get_tracer_provider(
+    tracing_endpoint: str,
+    server_cert: Optional[str],
+    resource_attributes: dict,
+) -> Optional["TracerProvider"]:
+    """Set up the tracer provider and its exporter, or return None if that fails.
+
+    An unreachable endpoint or a misconfiguration (e.g. a bad env override) should disable
+    tracing, not the charm.
+    """
+    if not _probe_endpoint(tracing_endpoint):
+        # don't let the exporter block the hook trying to reach a tempo that isn't there.
+        logger.warning(
+            f"tracing endpoint {tracing_endpoint} is unreachable: charm tracing disabled for this run."
+        )
+        return None
+
+    # the sdk and exporter pull in a lot of dependencies (protobuf, requests...):
+    # only import them if we're going to use them.
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+
+    try:
+        # we know exactly which attributes we want: use the plain constructor rather than
+        # Resource.create, which also runs the sdk/env resource detectors and merges their output.
+        resource = Resource(attributes=resource_attributes)
+        # we shut the provider down ourselves on framework.close; registering an atexit hook
+        # would make the interpreter block on exporting whatever the flush couldn't send.
+        provider = TracerProvider(resource=resource, shutdown_on_exit=False)
+
+        exporter = OTLPSpanExporter(
+            endpoint=tracing_endpoint,
+            certificate_file=server_cert,
+            timeout=2,
+        )
+        provider.add_span_processor(_get_span_processor(exporter))
+    except Exception:
+        logger.exception("failed to set up charm tracing: charm tracing disabled for this run.")
+        return None
+    return provider
 
 
 def _setup_root_span_initializer(
@@ -433,7 +720,6 @@ def _setup_root_span_initializer(
     """Patch the charm's initializer."""
     original_init = charm_type.__init__
 
-    @functools.wraps(original_init)
     def wrap_init(self: CharmBase, framework: Framework, *args, **kwargs):
         # we're using 'self' here because this is charm init code, makes sense to read what's below
         # from the perspective of the charm. Self.unit.name...
@@ -441,9 +727,11 @@ def _setup_root_span_initializer(
         original_init(self, framework, *args, **kwargs)
         # we call this from inside the init context instead of, say, _autoinstrument, because we want it to
         # be checked on a per-charm-instantiation basis, not on a per-type-declaration one.
-        if not is_enabled():
-            # this will only happen during unittesting, hopefully, so it's fine to log a
-            # bit more verbosely
+        dispatch_path = os.getenv("JUJU_DISPATCH_PATH", "")  # something like hooks/install
+        event_name = dispatch_path.rpartition("/")[2]
+        if not is_enabled() or _is_skipped_event(event_name):
+            # this will only happen during unittesting or if the user opted out of tracing
+            # this event, so it's fine to log a bit more verbosely
             logger.info("Tracing DISABLED: skipping root span initialization")
             return
 
@@ -456,22 +744,6 @@ def _setup_root_span_initializer(
         _service_name = service_name or f"{self.app.name}-charm"
 
         unit_name = self.unit.name
-        # apply hacky patch to remove stale opentelemetry sdk packages on upgrade-charm.
-        # it could be trouble if someone ever decides to implement their own tracer parallel to
-        # ours and before the charm has inited. We assume they won't.
-        resource = Resource.create(
-            attributes={
-                "service.name": _service_name,
-                "compose_service": _service_name,
-                "charm_type": type(self).__name__,
-                # juju topology
-                "juju_unit": unit_name,
-                "juju_application": self.app.name,
-                "juju_model": self.model.name,
-                "juju_model_uuid": self.model.uuid,
-            }
-        )
-        provider = TracerProvider(resource=resource)
 
         # if anything goes wrong with retrieving the endpoint, we let the exception bubble up.
         tracing_endpoint = _get_tracing_endpoint(tracing_endpoint_attr, self, charm_type)
@@ -480,7 +752,7 @@ def _setup_root_span_initializer(
             # tracing is off if tracing_endpoint is None
             return
 
-        server_cert: Optional[Union[str, Path]] = (
+        server_cert = (
             _get_server_cert(server_cert_attr, self, charm_type) if server_cert_attr else None
         )
 
@@ -490,20 +762,27 @@ def _setup_root_span_initializer(
                 "Please point @trace_charm to a `server_cert` attr."
             )
 
-        exporter = OTLPSpanExporter(
-            endpoint=tracing_endpoint,
-            certificate_file=str(Path(server_cert).absolute()) if server_cert else None,
-            timeout=2,
+        provider = _get_tracer_provider(
+            tracing_endpoint,
+            server_cert,
+            {
+                "service.name": _service_name,
+                "compose_service": _service_name,
+                "charm_type": type(self).__name__,
+                # juju topology
+                "juju_unit": unit_name,
+                "juju_application": self.app.name,
+                "juju_model": self.model.name,
+                "juju_model_uuid": self.model.uuid,
+            },
         )
+        if not provider:
+            return
 
-        processor = BatchSpanProcessor(exporter)
-        provider.add_span_processor(processor)
         set_tracer_provider(provider)
         _tracer = get_tracer(_service_name)  # type: ignore
-        _tracer_token = tracer.set(_tracer)
+        _set_active_tracer(_tracer)
 
-        dispatch_path = os.getenv("JUJU_DISPATCH_PATH", "")  # something like hooks/install
-        event_name = dispatch_path.split("/")[1] if "/" in dispatch_path else dispatch_path
         root_span_name = f"{unit_name}: {event_name} event"
         span = _tracer.start_span(root_span_name, attributes={"juju.dispatch_path": dispatch_path})
 
@@ -514,39 +793,56 @@ def _setup_root_span_initializer(
         ctx = set_span_in_context(span)
 
         # log a trace id, so we can pick it up from the logs (and jhack) to look it up in tempo.
-        root_trace_id = hex(span.get_span_context().trace_id)[2:]  # strip 0x prefix
-        logger.debug(f"Starting root trace with id={root_trace_id!r}.")
+        root_trace_id = format(span.get_span_context().trace_id, "032x")
+        logger.debug("Starting root trace with id=%r.", root_trace_id)
 
-        span_token = opentelemetry.context.attach(ctx)  # type: ignore
+        span_token = attach(ctx)  # type: ignore
 
         @contextmanager
         def wrap_event_context(event_name: str):
-            dev_logger.info(f"entering event context: {event_name}")
+            dev_logger.debug("entering event context: %s", event_name)
+            tracer_ = _ACTIVE_TRACER
+            if tracer_ is None:
+                with original_event_context(event_name) as event_context:
+                    yield event_context
+                return
+
             # when the framework enters an event context, we create a span.
-            with _span("event: " + event_name) as event_context_span:
-                if event_context_span:
-                    # todo: figure out how to inject event attrs in here
-                    event_context_span.add_event(event_name)
-                yield original_event_context(event_name)
+            # This is what `tracer.start_as_current_span` would do, minus two layers of
+            # generator-based contextmanagers on every event.
+            event_context_span = tracer_.start_span("event: " + event_name)
+            # todo: figure out how to inject event attrs in here
+            event_context_span.add_event(event_name)
+            token = attach(set_span_in_context(event_context_span))
+            try:
+                with original_event_context(event_name) as event_context:
+                    yield event_context
+            except Exception as e:
+                event_context_span.record_exception(e)
+                event_context_span.set_status(Status(StatusCode.ERROR, f"{type(e).__name__}: {e}"))
+                raise
+            finally:
+                detach(token)
+                event_context_span.end()
 
         framework._event_context = wrap_event_context  # type: ignore
 
         original_close = framework.close
 
-        @functools.wraps(original_close)
         def wrap_close():
             dev_logger.info("tearing down tracer and flushing traces")
             span.end()
-            opentelemetry.context.detach(span_token)  # type: ignore
-            tracer.reset(_tracer_token)
-            tp = cast(TracerProvider, get_tracer_provider())
-            tp.force_flush(timeout_millis=1000)  # don't block for too long
-            tp.shutdown()
+            detach(span_token)  # type: ignore
+            _set_active_tracer(None)
+            # flush the provider we set up, not whatever the global one happens to be.
+            _flush_and_shutdown(provider)
             original_close()
 
         framework.close = wrap_close
         return
 
+    # no need for a full functools.wraps: we only care about preserving the signature.
+    wrap_init.__wrapped__ = original_init  # type: ignore
     charm_type.__init__ = wrap_init  # type: ignore
 
 
@@ -612,6 +908,12 @@ def trace_charm(
     return _decorator
 
 
+# types that trace_type has already instrumented, so that we don't wrap them twice.
+_INSTRUMENTED_TYPES: "weakref.WeakSet[type]" = weakref.WeakSet()
+# charm types whose initializer _autoinstrument has already patched.
+_INSTRUMENTED_CHARM_TYPES: "weakref.WeakSet[type]" = weakref.WeakSet()
+
+
 def _autoinstrument(
     charm_type: _T,
     tracing_endpoint_attr: str,
@@ -651,20 +953,57 @@ def _autoinstrument(
     :param extra_types: pass any number of types that you also wish to autoinstrument.
         For example, charm libs, relation endpoint wrappers, workload abstractions, ...
     """
-    dev_logger.info(f"instrumenting {charm_type}")
-    _setup_root_span_initializer(
-        charm_type,
-        tracing_endpoint_attr,
-        server_cert_attr=server_cert_attr,
-        service_name=service_name,
-    )
-    trace_type(charm_type)
+    if charm_type in _INSTRUMENTED_CHARM_TYPES:
+        # patching the initializer again would set up a second provider and root span.
+        dev_logger.debug("skipping %s (already instrumented)", charm_type)
+    else:
+        _INSTRUMENTED_CHARM_TYPES.add(charm_type)
+        dev_logger.debug("instrumenting %s", charm_type)
+        _setup_root_span_initializer(
+            charm_type,
+            tracing_endpoint_attr,
+            server_cert_attr=server_cert_attr,
+            service_name=service_name,
+        )
+        trace_type(charm_type)
+
     for type_ in extra_types:
         trace_type(type_)
 
     return charm_type
 
 
+def _is_ops_type(cls: type) -> bool:
+    return cls.__module__.partition(".")[0] == "ops"
+
+
+def _get_methods(cls: type) -> Iterator[Tuple[str, Callable, bool]]:
+    """Yield (name, function, is_static) for all functions and staticmethods defined on cls.
+
+    We walk the ``__dict__`` of each class in the MRO instead of using ``inspect.getmembers``,
+    which would needlessly invoke every descriptor and sort the results.
+    Attributes defined on subclasses shadow the ones with the same name on their bases.
+    Methods that a user type inherits from ops base classes are not traced: they'd only add
+    noise (and overhead) to the charm's own spans. If ``cls`` is itself an ops type (for example
+    passed via ``extra_types``), all of its methods are traced.
+    """
+    skip_ops_bases = not _is_ops_type(cls)
+    seen = set()
+    for klass in cls.__mro__:
+        if klass is object or (skip_ops_bases and _is_ops_type(klass)):
+            continue
+        for name, attr in vars(klass).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            if name.startswith("__"):
+                continue
+            if isinstance(attr, staticmethod):
+                yield name, attr.__func__, True
+            elif isinstance(attr, types.FunctionType):
+                yield name, attr, False
+
+
 def trace_type(cls: _T) -> _T:
     """Set up tracing on this class.
 
@@ -672,12 +1011,28 @@ def trace_type(cls: _T) -> _T:
     It assumes that this class is only instantiated after a charm type decorated with `@trace_charm`
     has been instantiated.
     """
-    dev_logger.info(f"instrumenting {cls}")
-    for name, method in inspect.getmembers(cls, predicate=inspect.isfunction):
-        dev_logger.info(f"discovered {method}")
+    if not is_enabled():
+        return cls
+    if cls in _INSTRUMENTED_TYPES:
+        dev_logger.debug("skipping %s (already instrumented)", cls)
+        return cls
+    _INSTRUMENTED_TYPES.add(cls)
+
+    dev_logger.debug("instrumenting %s", cls)
+    for name, method, is_static in list(_get_methods(cls)):
+        dev_logger.debug("discovered %s", method)
 
         if method.__name__.startswith("__"):
-            dev_logger.info(f"skipping {method} (dunder)")
+            dev_logger.debug("skipping %s (dunder)", method)
+            continue
+
+        if getattr(method, "_no_trace", False):
+            dev_logger.debug("skipping %s (no_trace)", method)
+            continue
+
+        if getattr(method, "_traced", False):
+            # inherited from a base class that has been instrumented already
+            dev_logger.debug("skipping %s (already traced)", method)
             continue
 
         # the span title in the general case should be:
@@ -699,13 +1054,23 @@ def trace_type(cls: _T) -> _T:
 
         new_method = trace_method(method, name=trace_method_name)
 
-        if isinstance(inspect.getattr_static(cls, name), staticmethod):
+        if is_static:
             new_method = staticmethod(new_method)
         setattr(cls, name, new_method)
 
     return cls
 
 
+def no_trace(function: _F) -> _F:
+    """Exclude this method from autoinstrumentation.
+
+    Use this decorator on cheap, frequently called methods (getters, one-line helpers, ...) of
+    autoinstrumented types, whose span would cost more than the method itself.
+    """
+    function._no_trace = True  # type: ignore
+    return function
+
+
 def trace_method(method: _F, name: Optional[str] = None) -> _F:
     """Trace this method.
 
@@ -723,18 +1088,29 @@ def trace_function(function: _F, name: Optional[str] = None) -> _F:
 
 
 def _trace_callable(callable: _F, qualifier: str, name: Optional[str] = None) -> _F:
-    dev_logger.info(f"instrumenting {callable}")
+    if not is_enabled():
+        return callable
+
+    dev_logger.debug("instrumenting %s", callable)
+
+    # the span name is fixed for a given callable: compute it once, not on every call.
+    name_ = name or getattr(callable, "__qualname__", getattr(callable, "__name__", str(callable)))
+    span_name = f"{qualifier} call: {name_}"
 
     # sig = inspect.signature(callable)
     @functools.wraps(callable)
     def wrapped_function(*args, **kwargs):  # type: ignore
-        name_ = name or getattr(
-            callable, "__qualname__", getattr(callable, "__name__", str(callable))
-        )
-        with _span(f"{qualifier} call: {name_}"):  # type: ignore
+        tracer_ = _ACTIVE_TRACER
+        if tracer_ is None:
+            # no tracer (yet, or anymore): don't pay for a span.
+            return callable(*args, **kwargs)  # type: ignore
+        # use the tracer's context manager directly rather than going through another
+        # generator-based context manager layer on every call.
+        with tracer_.start_as_current_span(span_name):
             return callable(*args, **kwargs)  # type: ignore
 
     # wrapped_function.__signature__ = sig
+    wrapped_function._traced = True  # type: ignore
     return wrapped_function  # type: ignore
 
 
@@ -59,6 +59,7 @@ follows
 
 
 """  # noqa: W505
+
 import json
 import logging
 from typing import (
@@ -93,7 +94,7 @@ LIBAPI = 1
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 6
+LIBPATCH = 7
 
 PYDEPS = ["pydantic>=2"]
 
@@ -108,6 +109,7 @@ IngesterProtocol = Literal[
 
 RawIngester = Tuple[IngesterProtocol, int]
 BUILTIN_JUJU_KEYS = {"ingress-address", "private-address", "egress-subnets"}
+_PERMISSION_DENIED_PREFIX = b"ERROR cannot read relation application settings: permission denied"
 
 
 class TracingError(RuntimeError):
@@ -199,6 +201,9 @@ class TracingProviderAppData(DatabagModel):  # noqa: D101
     ingesters: List[Ingester]
 
 
+_INGESTERS_ADAPTER = pydantic.TypeAdapter(List[Ingester])
+
+
 class _AutoSnapshotEvent(RelationEvent):
     __args__: Tuple[str, ...] = ()
     __optional_kwargs__: Dict[str, Any] = {}
@@ -394,22 +399,26 @@ class TracingEndpointProvider(Object):
 
         try:
             if self._charm.unit.is_leader():
+                app_data = TracingProviderAppData(
+                    host=self._host,
+                    ingesters=[
+                        Ingester(port=port, protocol=protocol)
+                        for protocol, port in self._ingesters
+                    ],
+                )
+                # serialize once, and only touch the databags that are out of date:
+                # each write is a relation-set call.
+                data = app_data.dump()
                 for relation in self._charm.model.relations[self._relation_name]:
-                    TracingProviderAppData(
-                        host=self._host,
-                        ingesters=[
-                            Ingester(port=port, protocol=protocol)
-                            for protocol, port in self._ingesters
-                        ],
-                    ).dump(relation.data[self._charm.app])
+                    databag = relation.data[self._charm.app]
+                    if dict(databag) != data:
+                        app_data.dump(databag)
 
         except ModelError as e:
             # args are bytes
             msg = e.args[0]
             if isinstance(msg, bytes):
-                if msg.startswith(
-                    b"ERROR cannot read relation application settings: permission denied"
-                ):
+                if msg.startswith(_PERMISSION_DENIED_PREFIX):
                     logger.error(
                         f"encountered error {e} while attempting to update_relation_data."
                         f"The relation must be gone."
@@ -434,7 +443,7 @@ class EndpointChangedEvent(_AutoSnapshotEvent):
     @property
     def ingesters(self) -> List[Ingester]:
         """Cast ingesters back from dict."""
-        return [Ingester(**i) for i in self._ingesters]
+        return _INGESTERS_ADAPTER.validate_python(self._ingesters)
 
 
 class TracingEndpointEvents(CharmEvents):
@@ -489,6 +498,8 @@ class TracingEndpointRequirer(Object):
 
         self._charm = charm
         self._relation_name = relation_name
+        # relation id -> (databag contents, parsed provider app data)
+        self._app_data_cache: Dict[int, Tuple[Dict[str, str], TracingProviderAppData]] = {}
 
         events = self._charm.on[self._relation_name]
         self.framework.observe(events.relation_changed, self._on_tracing_relation_changed)
@@ -513,33 +524,44 @@ class TracingEndpointRequirer(Object):
         relations = self.relations
         return relations[0] if relations else None
 
-    def is_ready(self, relation: Optional[Relation] = None):
-        """Is this endpoint ready?"""
-        relation = relation or self._relation
+    def _load_app_data(self, relation: Optional[Relation]) -> Optional[TracingProviderAppData]:
+        """Parse the remote application databag, or return None if it's not (yet) valid."""
         if not relation:
             logger.debug(f"no relation on {self._relation_name !r}: tracing not ready")
-            return False
+            return None
         if relation.data is None:
             logger.error(f"relation data is None for {relation}")
-            return False
+            return None
         if not relation.app:
             logger.error(f"{relation} event received but there is no relation.app")
-            return False
+            return None
+
+        databag = dict(relation.data[relation.app])
+        cached = self._app_data_cache.get(relation.id)
+        if cached and cached[0] == databag:
+            return cached[1]
+
         try:
-            TracingProviderAppData.load(relation.data[relation.app])
+            app_data = TracingProviderAppData.load(databag)
         except (json.JSONDecodeError, pydantic.ValidationError, DataValidationError):
             logger.info(f"failed validating relation data for {relation}")
-            return False
-        return True
+            return None
+
+        self._app_data_cache[relation.id] = (databag, app_data)
+        return app_data
+
+    def is_ready(self, relation: Optional[Relation] = None):
+        """Is this endpoint ready?"""
+        return self._load_app_data(relation or self._relation) is not None
 
     def _on_tracing_relation_changed(self, event):
         """Notify the providers that there is new endpoint information available."""
         relation = event.relation
-        if not self.is_ready(relation):
+        data = self._load_app_data(relation)
+        if data is None:
             self.on.endpoint_removed.emit(relation)  # type: ignore
             return
 
-        data = TracingProviderAppData.load(relation.data[relation.app])
         self.on.endpoint_changed.emit(relation, data.host, [i.dict() for i in data.ingesters])  # type: ignore
 
     def _on_tracing_relation_broken(self, event: RelationBrokenEvent):
@@ -550,11 +572,12 @@ class TracingEndpointRequirer(Object):
     def get_all_endpoints(
         self, relation: Optional[Relation] = None
     ) -> Optional[TracingProviderAppData]:
-        """Unmarshalled relation data."""
-        relation = relation or self._relation
-        if not self.is_ready(relation):
-            return
-        return TracingProviderAppData.load(relation.data[relation.app])  # type: ignore
+        """Unmarshalled relation data.
+
+        The returned model is cached for as long as the remote databag doesn't change, and is
+        shared between callers: don't mutate it.
+        """
+        return self._load_app_data(relation or self._relation)
 
     def _get_ingester(
         self, relation: Optional[Relation], protocol: IngesterProtocol, ssl: bool = False
@@ -562,9 +585,7 @@ class TracingEndpointRequirer(Object):
         app_data = self.get_all_endpoints(relation)
         if not app_data:
             return None
-        receivers: List[Ingester] = list(
-            filter(lambda i: i.protocol == protocol, app_data.ingesters)
-        )
+        receivers = [i for i in app_data.ingesters if i.protocol == protocol]
         if not receivers:
             logger.error(f"no receiver found with protocol={protocol!r}")
             return
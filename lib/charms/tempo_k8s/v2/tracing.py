@@ -69,6 +69,7 @@ follows
 
 
 """  # noqa: W505
+
 import enum
 import json
 import logging
@@ -84,7 +85,6 @@ from typing import (
     Sequence,
     Tuple,
     Union,
-    cast,
 )
 
 import pydantic
@@ -99,6 +99,14 @@ from ops.framework import EventSource, Object
 from ops.model import ModelError, Relation
 from pydantic import BaseModel, Field
 
+try:
+    # orjson is not a PYDEP of this library, but if the charm happens to have it, use it:
+    # it is considerably faster at parsing databag contents.
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is unaffected.
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:
+    _json_loads = json.loads
+
 # The unique Charmhub library identifier, never change it
 LIBID = "12977e9aa0b34367903d8afeb8c3d85d"
 
@@ -107,7 +115,7 @@ LIBAPI = 2
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 10
+LIBPATCH = 11
 
 PYDEPS = ["pydantic"]
 
@@ -131,6 +139,8 @@ RawReceiver = Tuple[ReceiverProtocol, str]
 """
 
 BUILTIN_JUJU_KEYS = {"ingress-address", "private-address", "egress-subnets"}
+# prefix of the hook tool error raised when writing to the databag of a relation that's gone
+_PERMISSION_DENIED_PREFIX = b"ERROR cannot read relation application settings: permission denied"
 
 
 class TransportProtocolType(str, enum.Enum):
@@ -191,11 +201,11 @@ if int(pydantic.version.VERSION.split(".")[0]) < 2:
         def load(cls, databag: MutableMapping):
             """Load this model from a Juju databag."""
             if cls._NEST_UNDER:
-                return cls.parse_obj(json.loads(databag[cls._NEST_UNDER]))
+                return cls.parse_obj(_json_loads(databag[cls._NEST_UNDER]))
 
             try:
                 data = {
-                    k: json.loads(v)
+                    k: _json_loads(v)
                     for k, v in databag.items()
                     # Don't attempt to parse model-external values
                     if k in {f.alias for f in cls.__fields__.values()}
@@ -206,7 +216,7 @@ if int(pydantic.version.VERSION.split(".")[0]) < 2:
                 raise DataValidationError(msg) from e
 
             try:
-                return cls.parse_raw(json.dumps(data))  # type: ignore
+                return cls.parse_obj(data)
             except pydantic.ValidationError as e:
                 msg = f"failed to validate databag: {databag}"
                 logger.debug(msg, exc_info=True)
@@ -257,11 +267,11 @@ else:
             """Load this model from a Juju databag."""
             nest_under = cls.model_config.get("_NEST_UNDER")  # type: ignore
             if nest_under:
-                return cls.model_validate(json.loads(databag[nest_under]))  # type: ignore
+                return cls.model_validate(_json_loads(databag[nest_under]))  # type: ignore
 
             try:
                 data = {
-                    k: json.loads(v)
+                    k: _json_loads(v)
                     for k, v in databag.items()
                     # Don't attempt to parse model-external values
                     if k in {(f.alias or n) for n, f in cls.__fields__.items()}
@@ -272,7 +282,7 @@ else:
                 raise DataValidationError(msg) from e
 
             try:
-                return cls.model_validate_json(json.dumps(data))  # type: ignore
+                return cls.model_validate(data)  # type: ignore
             except pydantic.ValidationError as e:
                 msg = f"failed to validate databag: {databag}"
                 logger.debug(msg, exc_info=True)
@@ -386,6 +396,20 @@ class TracingProviderAppData(DatabagModel):  # noqa: D101
     )
 
 
+if int(pydantic.version.VERSION.split(".")[0]) < 2:
+
+    def _parse_receivers(receivers: List[dict]) -> List[Receiver]:
+        """Validate a list of receiver dicts in one go."""
+        return pydantic.parse_obj_as(List[Receiver], receivers)
+
+else:
+    _RECEIVERS_ADAPTER = pydantic.TypeAdapter(List[Receiver])
+
+    def _parse_receivers(receivers: List[dict]) -> List[Receiver]:
+        """Validate a list of receiver dicts in one go."""
+        return _RECEIVERS_ADAPTER.validate_python(receivers)
+
+
 class TracingRequirerAppData(DatabagModel):  # noqa: D101
     """Application databag model for the tracing requirer."""
 
@@ -397,6 +421,13 @@ class _AutoSnapshotEvent(RelationEvent):
     __args__: Tuple[str, ...] = ()
     __optional_kwargs__: Dict[str, Any] = {}
 
+    # all attribute names to (de)serialize; computed once per subclass
+    _attrs: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._attrs = cls.__attrs__()
+
     @classmethod
     def __attrs__(cls):
         return cls.__args__ + tuple(cls.__optional_kwargs__.keys())
@@ -415,17 +446,8 @@ class _AutoSnapshotEvent(RelationEvent):
 
     def snapshot(self) -> dict:
         dct = super().snapshot()
-        for attr in self.__attrs__():
-            obj = getattr(self, attr)
-            try:
-                dct[attr] = obj
-            except ValueError as e:
-                raise ValueError(
-                    "cannot automagically serialize {}: "
-                    "override this method and do it "
-                    "manually.".format(obj)
-                ) from e
-
+        for attr in self._attrs:
+            dct[attr] = getattr(self, attr)
         return dct
 
     def restore(self, snapshot: dict) -> None:
@@ -450,7 +472,7 @@ class RelationInterfaceMismatchError(Exception):
         self,
         relation_name: str,
         expected_relation_interface: str,
-        actual_relation_interface: str,
+        actual_relation_interface: Optional[str],
     ):
         self.relation_name = relation_name
         self.expected_relation_interface = expected_relation_interface
@@ -519,8 +541,7 @@ def _validate_relation_by_interface_and_direction(
 
     relation = charm.meta.relations[relation_name]
 
-    # fixme: why do we need to cast here?
-    actual_relation_interface = cast(str, relation.interface_name)
+    actual_relation_interface = relation.interface_name
 
     if actual_relation_interface != expected_relation_interface:
         raise RelationInterfaceMismatchError(
@@ -528,18 +549,15 @@ def _validate_relation_by_interface_and_direction(
         )
 
     if expected_relation_role is RelationRole.provides:
-        if relation_name not in charm.meta.provides:
-            raise RelationRoleMismatchError(
-                relation_name, RelationRole.provides, RelationRole.requires
-            )
+        endpoints, opposite_role = charm.meta.provides, RelationRole.requires
     elif expected_relation_role is RelationRole.requires:
-        if relation_name not in charm.meta.requires:
-            raise RelationRoleMismatchError(
-                relation_name, RelationRole.requires, RelationRole.provides
-            )
+        endpoints, opposite_role = charm.meta.requires, RelationRole.provides
     else:
         raise TypeError("Unexpected RelationDirection: {}".format(expected_relation_role))
 
+    if relation_name not in endpoints:
+        raise RelationRoleMismatchError(relation_name, expected_relation_role, opposite_role)
+
 
 class RequestEvent(RelationEvent):
     """Event emitted when a remote requests a tracing endpoint."""
@@ -668,28 +686,33 @@ class TracingEndpointProvider(Object):
         if not self._charm.unit.is_leader():
             raise RuntimeError("only leader can do this")
 
+        app_data = TracingProviderAppData(
+            receivers=[
+                Receiver(
+                    url=url,
+                    protocol=ProtocolType(
+                        name=protocol,
+                        type=receiver_protocol_to_transport_protocol[protocol],
+                    ),
+                )
+                for protocol, url in receivers
+            ],
+        )
+        # serialize once, and only touch the databags that are out of date:
+        # each write is a relation-set call.
+        data = app_data.dump()
+
         for relation in self.relations:
             try:
-                TracingProviderAppData(
-                    receivers=[
-                        Receiver(
-                            url=url,
-                            protocol=ProtocolType(
-                                name=protocol,
-                                type=receiver_protocol_to_transport_protocol[protocol],
-                            ),
-                        )
-                        for protocol, url in receivers
-                    ],
-                ).dump(relation.data[self._charm.app])
+                databag = relation.data[self._charm.app]
+                if dict(databag) != data:
+                    app_data.dump(databag)
 
             except ModelError as e:
                 # args are bytes
                 msg = e.args[0]
                 if isinstance(msg, bytes):
-                    if msg.startswith(
-                        b"ERROR cannot read relation application settings: permission denied"
-                    ):
+                    if msg.startswith(_PERMISSION_DENIED_PREFIX):
                         logger.error(
                             f"encountered error {e} while attempting to update_relation_data."
                             f"The relation must be gone."
@@ -713,7 +736,7 @@ class EndpointChangedEvent(_AutoSnapshotEvent):
     @property
     def receivers(self) -> List[Receiver]:
         """Cast receivers back from dict."""
-        return [Receiver(**i) for i in self._receivers]
+        return _parse_receivers(self._receivers)
 
 
 class TracingEndpointRequirerEvents(CharmEvents):
@@ -772,6 +795,8 @@ class TracingEndpointRequirer(Object):
 
         self._charm = charm
         self._relation_name = relation_name
+        # relation id -> (databag contents, parsed provider app data)
+        self._app_data_cache: Dict[int, Tuple[Dict[str, str], TracingProviderAppData]] = {}
 
         events = self._charm.on[self._relation_name]
         self.framework.observe(events.relation_changed, self._on_tracing_relation_changed)
@@ -795,18 +820,18 @@ class TracingEndpointRequirer(Object):
 
         try:
             if self._charm.unit.is_leader():
+                app_data = TracingRequirerAppData(receivers=list(protocols))
+                data = app_data.dump()
                 for relation in relations:
-                    TracingRequirerAppData(
-                        receivers=list(protocols),
-                    ).dump(relation.data[self._charm.app])
+                    databag = relation.data[self._charm.app]
+                    if dict(databag) != data:
+                        app_data.dump(databag)
 
         except ModelError as e:
             # args are bytes
             msg = e.args[0]
             if isinstance(msg, bytes):
-                if msg.startswith(
-                    b"ERROR cannot read relation application settings: permission denied"
-                ):
+                if msg.startswith(_PERMISSION_DENIED_PREFIX):
                     logger.error(
                         f"encountered error {e} while attempting to request_protocols."
                         f"The relation must be gone."
@@ -833,35 +858,44 @@ class TracingEndpointRequirer(Object):
         relations = self.relations
         return relations[0] if relations else None
 
-    def is_ready(self, relation: Optional[Relation] = None):
-        """Is this endpoint ready?"""
-        relation = relation or self._relation
+    def _load_app_data(self, relation: Optional[Relation]) -> Optional[TracingProviderAppData]:
+        """Parse the remote application databag, or return None if it's not (yet) valid."""
         if not relation:
             logger.debug(f"no relation on {self._relation_name !r}: tracing not ready")
-            return False
+            return None
         if relation.data is None:
             logger.error(f"relation data is None for {relation}")
-            return False
+            return None
         if not relation.app:
             logger.error(f"{relation} event received but there is no relation.app")
-            return False
-        try:
-            databag = dict(relation.data[relation.app])
-            TracingProviderAppData.load(databag)
+            return None
+
+        databag = dict(relation.data[relation.app])
+        cached = self._app_data_cache.get(relation.id)
+        if cached and cached[0] == databag:
+            return cached[1]
 
+        try:
+            app_data = TracingProviderAppData.load(databag)
         except (json.JSONDecodeError, pydantic.ValidationError, DataValidationError):
             logger.info(f"failed validating relation data for {relation}")
-            return False
-        return True
+            return None
+
+        self._app_data_cache[relation.id] = (databag, app_data)
+        return app_data
+
+    def is_ready(self, relation: Optional[Relation] = None):
+        """Is this endpoint ready?"""
+        return self._load_app_data(relation or self._relation) is not None
 
     def _on_tracing_relation_changed(self, event):
         """Notify the providers that there is new endpoint information available."""
         relation = event.relation
-        if not self.is_ready(relation):
+        data = self._load_app_data(relation)
+        if data is None:
             self.on.endpoint_removed.emit(relation)  # type: ignore
             return
 
-        data = TracingProviderAppData.load(relation.data[relation.app])
         self.on.endpoint_changed.emit(relation, [i.dict() for i in data.receivers])  # type: ignore
 
     def _on_tracing_relation_broken(self, event: RelationBrokenEvent):
@@ -872,11 +906,12 @@ class TracingEndpointRequirer(Object):
     def get_all_endpoints(
         self, relation: Optional[Relation] = None
     ) -> Optional[TracingProviderAppData]:
-        """Unmarshalled relation data."""
-        relation = relation or self._relation
-        if not self.is_ready(relation):
-            return
-        return TracingProviderAppData.load(relation.data[relation.app])  # type: ignore
+        """Unmarshalled relation data.
+
+        The returned model is cached for as long as the remote databag doesn't change, and is
+        shared between callers: don't mutate it.
+        """
+        return self._load_app_data(relation or self._relation)
 
     def _get_endpoint(
         self, relation: Optional[Relation], protocol: ReceiverProtocol
@@ -884,9 +919,7 @@ class TracingEndpointRequirer(Object):
         app_data = self.get_all_endpoints(relation)
         if not app_data:
             return None
-        receivers: List[Receiver] = list(
-            filter(lambda i: i.protocol.name == protocol, app_data.receivers)
-        )
+        receivers = [i for i in app_data.receivers if i.protocol.name == protocol]
         if not receivers:
             logger.error(f"no receiver found with protocol={protocol!r}")
             return
@@ -64,4 +64,4 @@ def test_charm_tracer_multi_import_warning(caplog, monkeypatch):
             "event: start",
             "margherita/0: start event",
         ]
-        assert "Tracer not found in `tracer` context var." in caplog.records[0].message
+        assert "charm_tracing is imported from multiple paths" in caplog.records[0].message
@@ -1,11 +1,34 @@
 import functools
 import logging
 import os
-from unittest.mock import patch
+import socket
+import threading
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 import scenario
-from charms.tempo_k8s.v1.charm_tracing import CHARM_TRACING_ENABLED, get_current_span, trace
+from charms.tempo_k8s.v1 import charm_tracing
+from charms.tempo_k8s.v1.charm_tracing import (
+    _INSTRUMENTED_TYPES,
+    _PROBE_CACHE,
+    CHARM_TRACING_ENABLED,
+    CHARM_TRACING_EXPORT_TIMEOUT_MILLIS,
+    CHARM_TRACING_MAX_QUEUE_SIZE,
+    CHARM_TRACING_PROBE_TIMEOUT_MILLIS,
+    CHARM_TRACING_SKIP_EVENTS,
+    CHARM_TRACING_SPAN_PROCESSOR,
+    Span,
+    _flush_and_shutdown,
+    _get_batch_span_processor_config,
+    _get_methods,
+    _get_span_processor,
+    _probe_endpoint,
+    charm_tracing_disabled,
+    get_current_span,
+    no_trace,
+    trace,
+)
 from charms.tempo_k8s.v1.charm_tracing import _autoinstrument as autoinstrument
 from charms.tempo_k8s.v2.tracing import (
     ProtocolType,
@@ -14,6 +37,7 @@ from charms.tempo_k8s.v2.tracing import (
     TracingProviderAppData,
     TracingRequirerAppData,
 )
+from opentelemetry.trace import StatusCode
 from ops import EventBase, EventSource, Framework
 from ops.charm import CharmBase, CharmEvents
 from scenario import Context, State
@@ -34,6 +58,7 @@ def cleanup():
 
         opentelemetry.trace._TRACER_PROVIDER = tracer_provider
 
+    _PROBE_CACHE.clear()
     with patch("opentelemetry.trace._set_tracer_provider", new=patched_set_tracer_provider):
         yield
 
@@ -175,6 +200,7 @@ class MyCharmSimpleEvent(CharmBase):
 
     def _on_start(self, _):
         span = get_current_span()
+        assert isinstance(span, Span)
         span.add_event(
             "log",
             {
@@ -649,3 +675,488 @@ def test_wrapped_method_wrapping(caplog):
         spans = f.call_args_list[0].args[0]
         assert spans[0].name == "method call: MyCharmWrappedMethods.a"
         assert spans[1].name == "method call: @bad_wrapper(MyCharmWrappedMethods.b)"
+
+
+def test_batch_span_processor_config(monkeypatch):
+    monkeypatch.setenv(CHARM_TRACING_MAX_QUEUE_SIZE, "42")
+    monkeypatch.setenv(CHARM_TRACING_EXPORT_TIMEOUT_MILLIS, "-1")
+
+    config = _get_batch_span_processor_config()
+    assert config["max_queue_size"] == 42
+    # invalid values fall back to the default
+    assert config["export_timeout_millis"] == 3000
+    # unset values use the default
+    assert config["schedule_delay_millis"] == 500
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    (
+        (None, "BatchSpanProcessor"),
+        ("batch", "BatchSpanProcessor"),
+        ("simple", "SimpleSpanProcessor"),
+        ("gibberish", "BatchSpanProcessor"),
+    ),
+)
+def test_span_processor_selection(monkeypatch, value, expected):
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if value is not None:
+        monkeypatch.setenv(CHARM_TRACING_SPAN_PROCESSOR, value)
+
+    processor = _get_span_processor(ConsoleSpanExporter())
+    assert type(processor).__name__ == expected
+    processor.shutdown()
+
+
+def test_queue_smaller_than_batch(monkeypatch):
+    import opentelemetry
+
+    # smaller than the default max_export_batch_size
+    monkeypatch.setenv(CHARM_TRACING_MAX_QUEUE_SIZE, "64")
+    assert _get_batch_span_processor_config()["max_export_batch_size"] == 64
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmSimple, meta=MyCharmSimple.META)
+        ctx.run("start", State())
+
+    assert f.called
+
+
+def test_tracer_provider_setup_failure(caplog):
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f, patch(
+        "charms.tempo_k8s.v1.charm_tracing._get_span_processor",
+        side_effect=ValueError("bork"),
+    ):
+        ctx = Context(MyCharmSimple, meta=MyCharmSimple.META)
+        # tracing is disabled, but the charm still runs
+        ctx.run("start", State())
+
+    assert not f.called
+    assert "failed to set up charm tracing" in caplog.text
+
+
+def test_trace_type_disabled(monkeypatch):
+    monkeypatch.setenv(CHARM_TRACING_ENABLED, "0")
+
+    class Untraced:
+        def foo(self):
+            return "bar"
+
+    foo = Untraced.foo
+    assert trace(Untraced) is Untraced
+    # the methods were not wrapped at all
+    assert Untraced.foo is foo
+
+
+def test_charm_tracing_disabled_contextmanager():
+    class Untraced:
+        def foo(self):
+            return "bar"
+
+    foo = Untraced.foo
+    with charm_tracing_disabled():
+        assert trace(Untraced) is Untraced
+    assert Untraced.foo is foo
+    # the previous value is restored on exit
+    assert os.environ[CHARM_TRACING_ENABLED] == "1"
+
+
+def test_trace_type_idempotent():
+    class Base:
+        def foo(self):
+            return "bar"
+
+    class Sub(Base):
+        pass
+
+    foo = Base.foo
+    trace(Base)
+    traced_foo = Base.foo
+    assert traced_foo.__wrapped__ is foo
+
+    # tracing again does not wrap the wrapper
+    trace(Base)
+    assert Base.foo is traced_foo
+    # neither does tracing a subclass that inherits the traced method
+    trace(Sub)
+    assert "foo" not in vars(Sub)
+    assert Sub().foo() == "bar"
+
+
+def test_ops_base_methods_not_traced():
+    class MyEvent(EventBase):
+        def foo(self):
+            pass
+
+    # EventBase.defer, snapshot, restore... are skipped
+    assert [name for name, _, _ in _get_methods(MyEvent)] == ["foo"]
+
+
+@pytest.fixture
+def restore_container_type():
+    # instrumenting an ops type patches it for the whole test session: undo that.
+    from ops.model import Container
+
+    original = dict(vars(Container))
+    yield
+    for name, attr in original.items():
+        if vars(Container).get(name) is not attr:
+            setattr(Container, name, attr)
+    _INSTRUMENTED_TYPES.discard(Container)
+
+
+def test_ops_type_in_extra_types(restore_container_type):
+    import opentelemetry
+    from ops.model import Container
+
+    class MyCharmOpsType(CharmBase):
+        META = {"name": "frank", "containers": {"foo": {"resource": "foo-image"}}}
+
+        def __init__(self, framework: Framework):
+            super().__init__(framework)
+            framework.observe(self.on.start, self._on_start)
+
+        def _on_start(self, _):
+            self.unit.get_container("foo").can_connect()
+
+        @property
+        def tempo(self):
+            return "foo.bar:80"
+
+    autoinstrument(MyCharmOpsType, "tempo", extra_types=(Container,))
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmOpsType, meta=MyCharmOpsType.META)
+        ctx.run("start", State(containers=[scenario.Container("foo", can_connect=True)]))
+
+        spans = f.call_args_list[0].args[0]
+        assert "method call: Container.can_connect" in [span.name for span in spans]
+
+
+class MyCharmNoTrace(CharmBase):
+    META = {"name": "frank"}
+
+    def __init__(self, fw):
+        super().__init__(fw)
+        fw.observe(self.on.start, self._on_start)
+
+    def _on_start(self, _):
+        self.a()
+        self.b()
+
+    def a(self):
+        pass
+
+    @no_trace
+    def b(self):
+        pass
+
+    @property
+    def tempo(self):
+        return "foo.bar:80"
+
+
+autoinstrument(MyCharmNoTrace, "tempo")
+
+
+def test_no_trace(caplog):
+    import opentelemetry
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmNoTrace, meta=MyCharmNoTrace.META)
+        ctx.run("start", State())
+
+        spans = f.call_args_list[0].args[0]
+        span_names = [span.name for span in spans]
+        assert span_names == [
+            "method call: MyCharmNoTrace.a",
+            "method call: MyCharmNoTrace._on_start",
+            "event: start",
+            "frank/0: start event",
+        ]
+
+
+class MyCharmTwice(CharmBase):
+    META = {"name": "frank"}
+
+    def __init__(self, fw):
+        super().__init__(fw)
+        fw.observe(self.on.start, self._on_start)
+
+    def _on_start(self, _):
+        pass
+
+    @property
+    def tempo(self):
+        return "foo.bar:80"
+
+
+autoinstrument(MyCharmTwice, "tempo")
+autoinstrument(MyCharmTwice, "tempo")
+
+
+def test_autoinstrument_twice():
+    import opentelemetry
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmTwice, meta=MyCharmTwice.META)
+        ctx.run("start", State())
+
+        spans = [span for call in f.call_args_list for span in call.args[0]]
+        assert [span.name for span in spans] == [
+            "method call: MyCharmTwice._on_start",
+            "event: start",
+            "frank/0: start event",
+        ]
+
+
+def test_skip_events(monkeypatch):
+    import opentelemetry
+
+    monkeypatch.setenv(CHARM_TRACING_SKIP_EVENTS, "update-status, start")
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmNoTrace, meta=MyCharmNoTrace.META)
+        ctx.run("start", State())
+        assert not f.called
+
+        ctx.run("install", State())
+        assert f.called
+
+
+def test_probe_endpoint():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        endpoint = f"http://127.0.0.1:{port}/v1/traces"
+        assert _probe_endpoint(endpoint)
+
+    # the result is cached for a while, even if the endpoint goes down
+    assert _probe_endpoint(endpoint)
+    # without cache, we notice
+    _PROBE_CACHE.clear()
+    assert not _probe_endpoint(endpoint)
+
+
+def test_probe_endpoint_unparseable():
+    # we can't tell: let the exporter deal with it
+    assert _probe_endpoint("foo.bar:80/v1/traces")
+
+
+def test_probe_endpoint_slow_resolution(monkeypatch):
+    monkeypatch.setenv(CHARM_TRACING_PROBE_TIMEOUT_MILLIS, "100")
+
+    def hanging_create_connection(*args, **kwargs):
+        # e.g. name resolution hanging on a broken DNS: not covered by the socket timeout
+        time.sleep(2)
+        raise socket.gaierror("timed out")
+
+    with patch("socket.create_connection", new=hanging_create_connection):
+        start = time.time()
+        assert not _probe_endpoint("http://tempo.gone:4318/v1/traces")
+        assert time.time() - start < 1
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MyCharmUnreachable(CharmBase):
+    META = {"name": "frank"}
+    tempo_port = 0
+
+    def __init__(self, fw):
+        super().__init__(fw)
+        fw.observe(self.on.start, self._on_start)
+
+    def _on_start(self, _):
+        pass
+
+    @property
+    def tempo(self):
+        return f"http://127.0.0.1:{self.tempo_port}"
+
+
+autoinstrument(MyCharmUnreachable, "tempo")
+
+
+def test_unreachable_endpoint(monkeypatch):
+    monkeypatch.setattr(MyCharmUnreachable, "tempo_port", _closed_port())
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f, patch("opentelemetry.sdk.trace.TracerProvider") as tp:
+        ctx = Context(MyCharmUnreachable, meta=MyCharmUnreachable.META)
+        ctx.run("start", State())
+
+    assert not tp.called
+    assert not f.called
+
+
+@pytest.mark.parametrize(
+    "no_proxy, probed",
+    (
+        (None, False),
+        # the proxy doesn't apply to this endpoint: we probe it directly
+        ("127.0.0.1", True),
+    ),
+)
+def test_probe_skipped_behind_proxy(monkeypatch, no_proxy, probed):
+    for var in ("http_proxy", "HTTP_PROXY", "no_proxy", "NO_PROXY"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("HTTP_PROXY", "http://proxy.internal:3128")
+    if no_proxy:
+        monkeypatch.setenv("NO_PROXY", no_proxy)
+
+    # closed port: only the direct probe would notice
+    endpoint = f"http://127.0.0.1:{_closed_port()}/v1/traces"
+    assert _probe_endpoint(endpoint) is not probed
+
+
+class MyCharmEventContext(CharmBase):
+    META = {"name": "frank"}
+    tempo_endpoint = "foo.bar:80"
+    fail = False
+    seen_event_names = []
+
+    def __init__(self, fw):
+        super().__init__(fw)
+        fw.observe(self.on.start, self._on_start)
+
+    def _on_start(self, _):
+        # set by the framework's own event context
+        self.seen_event_names.append(self.framework._event_name)
+        if self.fail:
+            raise RuntimeError("bork")
+
+    @property
+    def tempo(self):
+        return self.tempo_endpoint
+
+
+autoinstrument(MyCharmEventContext, "tempo")
+
+
+@pytest.mark.parametrize("endpoint", ("foo.bar:80", None))
+def test_original_event_context_entered(monkeypatch, endpoint):
+    import opentelemetry
+
+    monkeypatch.setattr(MyCharmEventContext, "tempo_endpoint", endpoint)
+    monkeypatch.setattr(MyCharmEventContext, "seen_event_names", [])
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmEventContext, meta=MyCharmEventContext.META)
+        ctx.run("start", State())
+
+    assert MyCharmEventContext.seen_event_names == ["start"]
+    assert f.called is (endpoint is not None)
+
+
+def test_event_span_records_exception(monkeypatch):
+    import opentelemetry
+
+    monkeypatch.setattr(MyCharmEventContext, "fail", True)
+    monkeypatch.setattr(MyCharmEventContext, "seen_event_names", [])
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmEventContext, meta=MyCharmEventContext.META)
+        with pytest.raises(UncaughtCharmError):
+            ctx.run("start", State())
+
+    assert MyCharmEventContext.seen_event_names == ["start"]
+    spans = [span for call in f.call_args_list for span in call.args[0]]
+    event_span = next(span for span in spans if span.name == "event: start")
+    assert event_span.status.status_code == StatusCode.ERROR
+    assert "RuntimeError: bork" in event_span.status.description
+    assert [evt.name for evt in event_span.events] == ["start", "exception"]
+
+
+@pytest.mark.parametrize(
+    "force_flush, message",
+    (
+        ({"return_value": True}, None),
+        ({"return_value": False}, "timed out flushing charm traces"),
+        ({"side_effect": RuntimeError("bork")}, "failed flushing charm traces"),
+    ),
+)
+def test_flush_and_shutdown(caplog, force_flush, message):
+    shut_down = threading.Event()
+    tp = MagicMock()
+    tp.force_flush.configure_mock(**force_flush)
+    tp.shutdown.side_effect = shut_down.set
+
+    with caplog.at_level(logging.WARNING):
+        _flush_and_shutdown(tp)
+
+    # the provider is shut down even if flushing failed
+    assert shut_down.wait(timeout=1)
+    messages = [record.getMessage() for record in caplog.records]
+    if message:
+        assert len(messages) == 1
+        assert messages[0].startswith(message)
+    else:
+        assert not messages
+
+
+class MyCharmLegacyTracer(CharmBase):
+    META = {"name": "frank"}
+    seen_tracers = []
+
+    def __init__(self, fw):
+        super().__init__(fw)
+        fw.observe(self.on.start, self._on_start)
+
+    def _on_start(self, _):
+        self.seen_tracers.append(charm_tracing.tracer.get())
+
+    @property
+    def tempo(self):
+        return "foo.bar:80"
+
+
+autoinstrument(MyCharmLegacyTracer, "tempo")
+
+
+def test_legacy_tracer_contextvar(monkeypatch):
+    import opentelemetry
+
+    monkeypatch.setattr(MyCharmLegacyTracer, "seen_tracers", [])
+
+    with patch(
+        "opentelemetry.exporter.otlp.proto.http.trace_exporter.OTLPSpanExporter.export"
+    ) as f:
+        f.return_value = opentelemetry.sdk.trace.export.SpanExportResult.SUCCESS
+        ctx = Context(MyCharmLegacyTracer, meta=MyCharmLegacyTracer.META)
+        ctx.run("start", State())
+
+    (seen,) = MyCharmLegacyTracer.seen_tracers
+    assert isinstance(seen, opentelemetry.trace.Tracer)
+    # unset again once the charm is torn down
+    with pytest.raises(LookupError):
+        charm_tracing.tracer.get()
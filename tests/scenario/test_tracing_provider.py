@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 import pytest
 from charms.tempo_k8s.v1.charm_tracing import charm_tracing_disabled
-from charms.tempo_k8s.v2.tracing import ProtocolType, TracingProviderAppData
+from charms.tempo_k8s.v2.tracing import ProtocolType, Receiver, TracingProviderAppData
+from ops.model import RelationDataContent
 from scenario import Container, Context, Relation, State
 
 
@@ -46,3 +49,38 @@ def test_receivers_removed_on_relation_broken(context):
     assert [r.protocol for r in TracingProviderAppData.load(r_out.local_app_data).receivers] == [
         ProtocolType(name="otlp_http", type="http")
     ]
+
+
+@pytest.mark.parametrize("stale_keys", ({}, {"foo": "bar"}))
+def test_publish_receivers_only_writes_stale_databag(context, stale_keys):
+    receivers = [("otlp_grpc", "foo.com:10")]
+    published = TracingProviderAppData(
+        receivers=[
+            Receiver(url="foo.com:10", protocol=ProtocolType(name="otlp_grpc", type="grpc"))
+        ]
+    ).dump()
+    tracing = Relation(
+        "tracing",
+        remote_app_data={"receivers": '["otlp_grpc"]'},
+        local_app_data={**published, **stale_keys},
+    )
+    state = State(
+        leader=True,
+        relations=[tracing],
+        containers=[Container("tempo", can_connect=False)],
+    )
+
+    with charm_tracing_disabled():
+        with context.manager(tracing.created_event, state) as mgr:
+            with patch.object(
+                RelationDataContent,
+                "__setitem__",
+                autospec=True,
+                side_effect=RelationDataContent.__setitem__,
+            ) as setitem:
+                mgr.charm.tracing.publish_receivers(receivers)
+
+            # an up-to-date databag is left alone; one with stale keys is rewritten
+            assert setitem.called is bool(stale_keys)
+            relation = mgr.charm.model.get_relation("tracing")
+            assert dict(relation.data[mgr.charm.app]) == published
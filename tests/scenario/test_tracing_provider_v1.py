@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+import pytest
+from charms.tempo_k8s.v1.charm_tracing import charm_tracing_disabled
+from charms.tempo_k8s.v1.tracing import Ingester, TracingEndpointProvider, TracingProviderAppData
+from ops import CharmBase, Framework
+from ops.model import RelationDataContent
+from scenario import Context, Relation, State
+
+
+class MyCharm(CharmBase):
+    def __init__(self, framework: Framework):
+        super().__init__(framework)
+        self.tracing = TracingEndpointProvider(self, host="foo.com", ingesters=[("otlp_grpc", 10)])
+
+
+@pytest.fixture
+def context():
+    return Context(
+        charm_type=MyCharm,
+        meta={"name": "tempo", "provides": {"tracing": {"interface": "tracing"}}},
+    )
+
+
+@pytest.mark.parametrize("stale_keys", ({}, {"foo": '"bar"'}))
+def test_ingesters_only_written_to_stale_databag(context, stale_keys):
+    published = TracingProviderAppData(
+        host="foo.com", ingesters=[Ingester(protocol="otlp_grpc", port=10)]
+    ).dump()
+    tracing = Relation("tracing", local_app_data={**published, **stale_keys})
+    state = State(leader=True, relations=[tracing])
+
+    with charm_tracing_disabled(), patch.object(
+        RelationDataContent,
+        "__setitem__",
+        autospec=True,
+        side_effect=RelationDataContent.__setitem__,
+    ) as setitem:
+        state_out = context.run(tracing.joined_event, state)
+
+    # an up-to-date databag is left alone; one with stale keys is rewritten
+    assert setitem.called is bool(stale_keys)
+    assert state_out.get_relations("tracing")[0].local_app_data == published
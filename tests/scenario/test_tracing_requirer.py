@@ -1,4 +1,5 @@
 import socket
+from unittest.mock import patch
 
 import pytest
 from charms.tempo_k8s.v1.charm_tracing import charm_tracing_disabled
@@ -9,6 +10,7 @@ from charms.tempo_k8s.v2.tracing import (
     TracingEndpointRequirer,
 )
 from ops import CharmBase, Framework, RelationBrokenEvent, RelationChangedEvent
+from ops.model import RelationDataContent
 from scenario import Context, Relation, State
 
 from tempo import Tempo
@@ -88,6 +90,31 @@ def test_requirer_api_with_internal_scheme(context):
     assert epchanged.receivers[0].protocol.name == "otlp_grpc"
 
 
+def test_endpoints_cache_invalidated_on_databag_change(context):
+    tracing = Relation(
+        "tracing",
+        remote_app_data={
+            "receivers": '[{"protocol": {"name": "otlp_grpc", "type": "grpc"}, "url": "foo.com:4317"}]',
+        },
+    )
+    state = State(leader=True, relations=[tracing])
+
+    with charm_tracing_disabled():
+        with context.manager(tracing.changed_event, state) as mgr:
+            charm = mgr.charm
+            rel = charm.model.get_relation("tracing")
+            assert charm.tracing.get_endpoint("otlp_grpc") == "foo.com:4317"
+            # unchanged databag: the parsed data is reused
+            assert charm.tracing.get_all_endpoints() is charm.tracing.get_all_endpoints()
+
+            # the remote app publishes a new url
+            rel.data[rel.app]._update(
+                "receivers",
+                '[{"protocol": {"name": "otlp_grpc", "type": "grpc"}, "url": "bar.com:4317"}]',
+            )
+            assert charm.tracing.get_endpoint("otlp_grpc") == "bar.com:4317"
+
+
 def test_ingressed_requirer_api(context):
     # WHEN external_url is present in remote app databag
     external_url = "http://1.2.3.4"
@@ -199,3 +226,29 @@ def test_not_requested_raises(context):
             charm = mgr.charm
             with pytest.raises(ProtocolNotRequestedError):
                 charm.tracing.get_endpoint("otlp_http")
+
+
+@pytest.mark.parametrize(
+    "local_app_data, rewritten",
+    (
+        # up to date: left alone
+        ({"receivers": '["otlp_grpc"]'}, False),
+        # stale keys: rewritten from scratch
+        ({"receivers": '["otlp_grpc"]', "foo": "bar"}, True),
+        ({"receivers": '["otlp_http"]'}, True),
+    ),
+)
+def test_request_protocols_only_writes_stale_databag(context, local_app_data, rewritten):
+    tracing = Relation("tracing", local_app_data=local_app_data)
+    state = State(leader=True, relations=[tracing])
+
+    with charm_tracing_disabled(), patch.object(
+        RelationDataContent,
+        "__setitem__",
+        autospec=True,
+        side_effect=RelationDataContent.__setitem__,
+    ) as setitem:
+        state_out = context.run(tracing.changed_event, state)
+
+    assert setitem.called is rewritten
+    assert state_out.get_relations("tracing")[0].local_app_data == {"receivers": '["otlp_grpc"]'}
@@ -0,0 +1,66 @@
+import pytest
+from charms.tempo_k8s.v1.charm_tracing import charm_tracing_disabled
+from charms.tempo_k8s.v1.tracing import EndpointChangedEvent, TracingEndpointRequirer
+from ops import CharmBase, Framework
+from scenario import Context, Relation, State
+
+
+class MyCharm(CharmBase):
+    def __init__(self, framework: Framework):
+        super().__init__(framework)
+        self.tracing = TracingEndpointRequirer(self)
+
+
+@pytest.fixture
+def context():
+    return Context(
+        charm_type=MyCharm,
+        meta={"name": "jolly", "requires": {"tracing": {"interface": "tracing", "limit": 1}}},
+    )
+
+
+def test_requirer_api(context):
+    tracing = Relation(
+        "tracing",
+        remote_app_data={
+            "host": '"foo.com"',
+            "ingesters": '[{"protocol": "otlp_grpc", "port": 4317}, '
+            '{"protocol": "otlp_http", "port": 4318}]',
+        },
+    )
+    state = State(leader=True, relations=[tracing])
+
+    with charm_tracing_disabled():
+        with context.manager(tracing.changed_event, state) as mgr:
+            charm = mgr.charm
+            assert charm.tracing.is_ready()
+            assert charm.tracing.otlp_grpc_endpoint() == "foo.com:4317"
+            assert charm.tracing.otlp_http_endpoint() == "http://foo.com:4318"
+            assert charm.tracing.zipkin_endpoint() is None
+
+    _, epchanged = context.emitted_events
+    assert isinstance(epchanged, EndpointChangedEvent)
+    assert [i.protocol for i in epchanged.ingesters] == ["otlp_grpc", "otlp_http"]
+
+
+def test_endpoints_cache_invalidated_on_databag_change(context):
+    tracing = Relation(
+        "tracing",
+        remote_app_data={
+            "host": '"foo.com"',
+            "ingesters": '[{"protocol": "otlp_grpc", "port": 4317}]',
+        },
+    )
+    state = State(leader=True, relations=[tracing])
+
+    with charm_tracing_disabled():
+        with context.manager(tracing.changed_event, state) as mgr:
+            charm = mgr.charm
+            rel = charm.model.get_relation("tracing")
+            assert charm.tracing.otlp_grpc_endpoint() == "foo.com:4317"
+            # unchanged databag: the parsed data is reused
+            assert charm.tracing.get_all_endpoints() is charm.tracing.get_all_endpoints()
+
+            # the remote app publishes a new host
+            rel.data[rel.app]._update("host", '"bar.com"')
+            assert charm.tracing.otlp_grpc_endpoint() == "bar.com:4317"